@@ -13,7 +13,80 @@ df_utils
 list_utils
     Module providing functionality for manipulating and calculating statistics for
     lists of pandas DataFrames for the batch processing of multiple data sets.
+
+The subpackages are imported lazily on first access (e.g., df_tools.list_utils), so 'import df_tools' does not
+import pandas or numpy until they are needed. The functions of both subpackages (as well as DFToolsValidationError
+and set_checks) can also be imported directly from the package (e.g., 'from df_tools import idx0'), which loads
+only the module that defines them.
 """
 
+import importlib
+
 __version__ = 'df_tools-v1.1'
 __all__ = ['df_utils', 'list_utils', '__version__']
+
+# Submodules that are only imported when first accessed as attributes of the package.
+_LAZY_SUBMODULES = ('df_utils', 'list_utils')
+# Functions/classes re-exported from the package, mapped to the module that defines them.
+_LAZY_ATTRS = {
+    # df_utils.py functions
+    'idx0': 'df_tools.df_utils',
+    'avg_cols': 'df_tools.df_utils',
+    'avg_rows': 'df_tools.df_utils',
+    'drop_cols': 'df_tools.df_utils',
+    'top_series_mean': 'df_tools.df_utils',
+    'top_series_max': 'df_tools.df_utils',
+    'top_series_quantile': 'df_tools.df_utils',
+    'norm_cols_each': 'df_tools.df_utils',
+    'norm_cols_all': 'df_tools.df_utils',
+    # list_utils.py functions
+    'create_df_ls': 'df_tools.list_utils',
+    'idx0_ls': 'df_tools.list_utils',
+    'drop_cols_df_ls': 'df_tools.list_utils',
+    'norm_by_factors': 'df_tools.list_utils',
+    'df_col_avg_sum': 'df_tools.list_utils',
+    'find_min_rows': 'df_tools.list_utils',
+    'truncate_dfs': 'df_tools.list_utils',
+    'dropna_df_ls': 'df_tools.list_utils',
+    'set_indices_ls': 'df_tools.list_utils',
+    'top_series_mean_ls': 'df_tools.list_utils',
+    'top_series_max_ls': 'df_tools.list_utils',
+    'top_series_quantile_ls': 'df_tools.list_utils',
+    'concat_ls': 'df_tools.list_utils',
+    'concat_trans_ls': 'df_tools.list_utils',
+    'norm_cols_each_ls': 'df_tools.list_utils',
+    'norm_cols_all_ls': 'df_tools.list_utils',
+    # Exception raised on invalid input, and the switch for input checking
+    'DFToolsValidationError': 'df_tools._err_check',
+    'set_checks': 'df_tools._err_check',
+}
+
+
+def __getattr__(name):
+    """
+    This function imports a df_tools submodule, or the submodule defining a re-exported function, the first time it
+        is accessed as an attribute of the package (PEP 562). The result is cached in the package namespace so that
+        later lookups skip this function.
+
+    Parameters:
+    :param name: Name of the attribute being looked up.
+    :return: The imported submodule or function.
+    """
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module('df_tools.' + name)
+    elif name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    else:
+        raise AttributeError("module 'df_tools' has no attribute '%s'" % name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    This function lists the package attributes, including submodules and functions that have not been imported yet.
+
+    Parameters:
+    :return: Sorted list of attribute names.
+    """
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_ATTRS))
@@ -4,71 +4,118 @@
 This module provides functions for error checking to use either for other
 df_tools modules or otherwise.
 
+Validation failures raise DFToolsValidationError, a subclass of ValueError, whose message names the df_tools
+function that received the invalid input along with the line and module of the offending call.
+
+Like assert statements, the check functions are skipped when Python runs with optimizations enabled (python -O),
+so validated production pipelines don't pay for them. Run without -O during development to get full checking.
+The checks can also be switched off at runtime with set_checks(False) (available as df_tools.set_checks), e.g.
+for hot loops over many small DataFrames whose inputs are already known to be valid.
+
 Functions:
-check_ls, check_eq_ls_len, check_numeric, check_int, check_string, check_bool,
-check_dfs, param_exists_in_set, check_threshold, parent_fn_mod_2step, parent_fn_mod_3step.
+set_checks, check_ls, check_eq_ls_len, check_numeric, check_int, check_string, check_bool,
+check_dfs, check_float_dtype, param_exists_in_set, check_threshold, invalid_input_error, parent_fn_mod_2step,
+parent_fn_mod_3step.
 
 Please see the doc strings of individual functions for further information.
 """
 
-from inspect import *
+from collections.abc import Sequence
 import pandas as pd
 import numpy as np
-import sys
+from sys import _getframe
 
-__all__ = ['check_ls',
+__all__ = ['DFToolsValidationError',
+           'set_checks',
+           'check_ls',
            'check_eq_ls_len',
            'check_numeric',
            'check_int',
            'check_string',
            'check_bool',
            'check_dfs',
+           'check_float_dtype',
            'param_exists_in_set',
            'check_threshold',
+           'invalid_input_error',
            'parent_fn_mod_2step',
            'parent_fn_mod_3step']
 
+# dtype kinds (bool, signed/unsigned int, float, complex) and scalar types accepted as numeric by check_numeric.
+_NUMERIC_KINDS = frozenset('biufc')
+_NUMERIC_TYPES = (int, float, complex, np.number)
+# Type accepted by check_dfs, bound once at import.
+_DF_TYPE = pd.DataFrame
+# Message of every DFToolsValidationError: calling function, line number, module and the description of the error.
+_INVALID_INPUT_MSG = 'Invalid input for function %s (line %i in module %s): %s'
+# Runtime switch for the check functions; see set_checks.
+_CHECKS_ENABLED = True
+
+
+class DFToolsValidationError(ValueError):
+    """
+    Exception raised by the check_* functions when a parameter fails validation.
+    """
+    pass
+
+
+def set_checks(enabled=True):
+    """
+    This function switches the check functions on or off for all df_tools functions. With checks off, invalid input
+        is no longer reported with a DFToolsValidationError and may instead cause obscure errors or wrong results, so
+        only switch them off for pipelines whose inputs have already been validated.
+
+    Parameters:
+    :param enabled: True to run the checks (default), False to skip them.
+    :return: Nothing.
+    """
+    global _CHECKS_ENABLED
+    _CHECKS_ENABLED = bool(enabled)
+
+    return 0
+
 
 def check_ls(ls):
     """
-    This function checks if an object is a list. If not, it returns an error, noting that a list is required.
+    This function checks if an object is a list or another sequence (e.g., a tuple). Strings and bytes are not accepted.
+        If the object is not a sequence, it raises a DFToolsValidationError, noting that a list is required.
 
     Parameters:
-    :param ls: Object to check. A list is expected.
+    :param ls: Object to check. A list (or other sequence that is not a string or bytes) is expected.
     :return: Nothing.
     """
-    if isinstance(ls, list):
-        pass
-    else:
-        main_module, main_fn, main_lineno = parent_fn_mod_3step()
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    # Plain lists are by far the most common input, so check for them before the slower abstract base class check.
+    if type(ls) is list:
+        return 0
+    if not isinstance(ls, Sequence) or isinstance(ls, (str, bytes, bytearray)):
         calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-        print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-        print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-        print('         Invalid input for function %s' % calling_fn)
-        sys.exit('          ERROR: A list is required.')
+        raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module,
+                                                           'A list is required.'))
 
     return 0
 
 
 def check_eq_ls_len(list_ls=[]):
     """
-    This function checks a list of lists to ensure that they are all the same length. If they are not, an error is
-        returned, and the script is exited.
+    This function checks a list of lists to ensure that they are all the same length. If they are not, a
+        DFToolsValidationError is raised.
 
     Parameters:
     :param list_ls: A list of lists in which each member's length will be compared to the others.
     :return: Nothing.
     """
-    for ls_no in range(0, len(list_ls)-1):
-        if len(list_ls[ls_no]) == len(list_ls[ls_no + 1]):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    # Compare every list against the length of the first, stopping at the first mismatch.
+    ls_iter = iter(list_ls)
+    first_len = len(next(ls_iter, ()))
+    for ls in ls_iter:
+        if len(ls) != first_len:
             calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Invalid input for function %s' % calling_fn)
-            sys.exit('          ERROR: Length of at least 2 lists are unequal.')
+            raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module,
+                                                               'Length of at least 2 lists are unequal.'))
 
     return 0
 
@@ -76,138 +123,124 @@ def check_eq_ls_len(list_ls=[]):
 def check_numeric(values=[]):
     """
     This function checks to see if all values in a list are numerical. It passed tests with nans and strings. If a
-        non-numerical value is found (by type cast to integer), then it an error is returned and the script stops. The
-        resulting error will indicate the calling module, function and line number within the calling module.
+        non-numerical value is found, then a DFToolsValidationError is raised. The resulting error will indicate the
+        calling module, function and line number within the calling module.
 
     Parameters:
-    :param values: A list of values to check to ensure that they are numeric. If they are not, an error is returned,
-        and the script is exited.
+    :param values: A list of values to check to ensure that they are numeric. If they are not, a
+        DFToolsValidationError is raised.
     :return: Nothing.
     """
-    # Todo: The following numpy types were not being recognized at a certain point during testing. The cause is
-    # todo: unknown since they were initially working fine. Will work to re-implement them in future versions.
-    # Problematic types: np.int128, no.float80, np.float96, np.float128, np.float256, np.uint128, np.int128
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    # Determine the dtype of the whole list in one pass. Only fall back to checking values one by one (to find the
+    # offending value for the error message) when numpy can't infer a numeric dtype for the list.
+    try:
+        kind = np.asarray(values).dtype.kind
+    except (TypeError, ValueError):
+        kind = 'O'
+    if kind in _NUMERIC_KINDS:
+        return 0
 
-    numeric_types = (int, float, complex, np.int, np.int8, np.int16, np.int32, np.int64, np.float,
-                     np.float16, np.float32, np.float64, np.uint8, np.uint16, np.uint32, np.uint64)
-    for val, valnum in zip(values, range(len(values))):
-        if isinstance(val, numeric_types):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
-            calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Non-numeric value "%s" found list at index %i!' % (val, valnum))
-            sys.exit('         ERROR: All values must be of numerical type (int, float, complex, numpy.*.')
-    return 0
+    return _check_all(values, _NUMERIC_TYPES, 'numeric', 'of numerical type (int, float, complex, numpy.*)')
 
 
 def check_int(values=[]):
     """
-    This function checks if every item in a list is an integer. Otherwise, it returns an error and exits the script.
+    This function checks if every item in a list is an integer. Otherwise, it raises a DFToolsValidationError.
 
     Parameters:
     :param values: List of values/objects that will be tested as to whether or not they are integers. If any are not,
-        an error is returned, and the script is exited.
+        a DFToolsValidationError is raised.
     :return: Nothing.
     """
-    for val, valnum in zip(values, range(len(values))):
-        if isinstance(val, int):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
-            calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Non-integer frame object "%s" found list at index %i!' % (val, valnum))
-            sys.exit('         ERROR: All values must be integers.')
-    return 0
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    return _check_all(values, int, 'integer', 'integers')
 
 
 def check_string(values=[]):
     """
-    This function checks if every item in a list is an integer. Otherwise, it returns an error and exits the script.
+    This function checks if every item in a list is a string. Otherwise, it raises a DFToolsValidationError.
 
     Parameters:
     :param values: List of values/objects that will be tested as to whether or not they are strings. If any are not,
-        an error is returned and the script is exited.
+        a DFToolsValidationError is raised.
     :return: Nothing.
     """
-    for val, valnum in zip(values, range(len(values))):
-        if isinstance(val, str):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
-            calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Non-string frame object "%s" found list at index %i!' % (val, valnum))
-            sys.exit('         ERROR: All values must be strings.')
-    return 0
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    return _check_all(values, str, 'string', 'strings')
 
 
 def check_bool(values=[]):
     """
-    This function checks whether or not a list of values are boolean. If not, returns an error, echos to the terminal
-        and exits the script.
+    This function checks whether or not a list of values are boolean. If not, a DFToolsValidationError is raised.
         
     Parameters:
     :param values: Values to check whether or not they are boolean (i.e., True/False)
     :return: Nothing
     """
-    for val, valnum in zip(values, range(len(values))):
-        if isinstance(val, bool):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
-            calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Non-bool object "%s" found list at index %i!' % (val, valnum))
-            sys.exit('         ERROR: All values must be boolean (True/False).')
-
-    return 0
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    return _check_all(values, bool, 'bool', 'boolean (True/False)')
 
 
 def check_dfs(values=[]):
     """
-    This function checks if every item in a list is a pandas DataFrame. If any are not, an error is returned, and the
-        script is exited.
+    This function checks if every item in a list is a pandas DataFrame. If any are not, a DFToolsValidationError is
+        raised.
     
     Parameters:
     :param values: List of values/objects that will be tested as to whether or not they are pandas DataFrames.
     :return: Nothing.
     """
-    for val, valnum in zip(values, range(len(values))):
-        if isinstance(val, pd.DataFrame):
-            pass
-        else:
-            main_module, main_fn, main_lineno = parent_fn_mod_3step()
-            calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-            print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-            print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-            print('         Non-DataFrame object "%s" found in list at index %i!' % (val, valnum))
-            sys.exit('         ERROR: All values must be pandas DataFrames.')
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    # Lists of plain DataFrames (the common case) only need a type identity check. DataFrame subclasses and invalid
+    # values fall through to the isinstance check in _check_all.
+    if all(type(val) is _DF_TYPE for val in values):
+        return 0
+
+    return _check_all(values, _DF_TYPE, 'DataFrame', 'pandas DataFrames')
+
+
+def check_float_dtype(dtype):
+    """
+    This function checks if an object describes a numpy floating point dtype (e.g., numpy.float32, 'float64'). If not,
+        a DFToolsValidationError is raised.
+
+    Parameters:
+    :param dtype: The dtype (or object convertible to a numpy dtype) to check.
+    :return: Nothing.
+    """
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    try:
+        kind = np.dtype(dtype).kind
+    except TypeError:
+        kind = None
+    if dtype is None or kind != 'f':
+        calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
+        detail = 'dtype "%s" is not a float dtype. Please use a numpy float dtype (e.g., numpy.float32).' % (dtype,)
+        raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module, detail))
+
     return 0
 
 
 def param_exists_in_set(value, val_set=[]):
     """
-    This function checks if the passed value exists in a set of values
+    This function checks if the passed value exists in a set of values. If not, a DFToolsValidationError is raised.
     :param value: The value to check for in the set.
     :param val_set: Set of values in which to check for parameter, value
     :return: Nothing
     """
-    if value in val_set:
-        pass
-    else:
-        main_module, main_fn, main_lineno = parent_fn_mod_3step()
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
+    if value not in val_set:
         calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-        print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-        print('     Error on line %i in module %s' % (calling_lineno, calling_module))
-        print('         Value "%s" not found in set: %s. Please use one of these values as input.' % (value, val_set))
-        sys.exit('         ERROR: Incorrect parameter value.')
+        detail = 'Value "%s" not found in set: %s. Please use one of these values as input.' % (value, val_set)
+        raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module, detail))
 
     return 0
 
@@ -215,7 +248,7 @@ def param_exists_in_set(value, val_set=[]):
 def check_threshold(values=[], thresh=1.0, how='under'):
     """
     This function checks to see whether or not a numeric value is less than/equal to or greater than/equal to a
-     given threshold value. If any are not, an error is returned, and the script is exited.
+     given threshold value. If any are not, a DFToolsValidationError is raised.
 
     Parameters:
     :param values: Values to check whether or not they are under or over a threshold, depending on the parameter 'how'
@@ -223,38 +256,72 @@ def check_threshold(values=[], thresh=1.0, how='under'):
     :param how: An option to test whether the values are 'under' (less than/equal to) or 'over' (greater than/equal to).
     :return:
     """
+    if not __debug__ or not _CHECKS_ENABLED:
+        return 0
     # Check to make sure the arguments values and thresh are numeric (using check_numeric function in _err_check.py),
     # and that how is a string value, with 'over' or 'under' as the value.
     check_numeric(values=values)
-    check_numeric(values=[thresh])
+    if not isinstance(thresh, _NUMERIC_TYPES):
+        check_numeric(values=[thresh])
     check_string(values=[how])
     param_exists_in_set(value=how, val_set=['under', 'over'])
 
-    for val in values:
+    # Compare all values to the threshold at once, and only locate the first offending value if the check fails.
+    arr = np.asarray(values, dtype=float)
+    if how == 'under':
+        in_bounds = arr <= thresh
+    else:
+        in_bounds = arr >= thresh
+    if not in_bounds.all():
+        val = arr[np.argmin(in_bounds)]
+        calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
         if how == 'under':
-            if val <= thresh:
-                pass
-            else:
-                main_module, main_fn, main_lineno = parent_fn_mod_3step()
-                calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-                print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-                print('     Error at line %i in module %s' % (calling_lineno, calling_module))
-                print('         Value (%0.2f) is over the maximum value of %0.2f' % (val, thresh))
-                sys.exit('         ERROR: Parameter over maximum threshold.')
-        elif how == 'over':
-            if val >= thresh:
-                pass
-            else:
-                main_module, main_fn, main_lineno = parent_fn_mod_3step()
-                calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
-                print('On line %i in function %s of module %s' % (main_lineno, main_fn, main_module))
-                print('     Error at line %i in module %s' % (calling_lineno, calling_module))
-                print('         Value (%0.2f) is under the minimum value of %0.2f' % (val, thresh))
-                sys.exit('         ERROR: Parameter under minimum threshold.')
+            detail = 'Value (%0.2f) is over the maximum value of %0.2f.' % (val, thresh)
+        else:
+            detail = 'Value (%0.2f) is under the minimum value of %0.2f.' % (val, thresh)
+        raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module, detail))
 
     return 0
 
 
+def _check_all(values, val_type, type_name, requirement):
+    """
+    This function performs the checks for check_numeric, check_int, check_string, check_bool and check_dfs. It checks
+        that every item in a list is an instance of val_type. If any are not, a DFToolsValidationError is raised. The
+        caller's frame info is only looked up once an invalid value has been found.
+
+    Parameters:
+    :param values: List of values/objects to check.
+    :param val_type: Type (or tuple of types) that every value is expected to be an instance of.
+    :param type_name: Name of the expected type, used in the message for the offending value.
+    :param requirement: Description of the expected type, used in the error message.
+    :return: Nothing.
+    """
+    for valnum, val in enumerate(values):
+        if not isinstance(val, val_type):
+            # Frame 2 is the caller of the public check_* function.
+            calling_frame = _getframe(2)
+            detail = 'Non-%s object "%s" found in list at index %i. All values must be %s.' % (type_name, val, valnum,
+                                                                                                requirement)
+            raise DFToolsValidationError(_INVALID_INPUT_MSG % (calling_frame.f_code.co_name, calling_frame.f_lineno,
+                                                               calling_frame.f_code.co_filename, detail))
+    return 0
+
+
+def invalid_input_error(detail):
+    """
+    This function creates a DFToolsValidationError for invalid input detected inside a df_tools function, with the
+        message naming that function along with its line and module. Unlike the check_* functions, it is not disabled
+        by python -O or set_checks(False), so it can be used for errors that must always be raised.
+
+    Parameters:
+    :param detail: Description of the invalid input.
+    :return: DFToolsValidationError to be raised by the calling function.
+    """
+    calling_module, calling_fn, calling_lineno = parent_fn_mod_2step()
+    return DFToolsValidationError(_INVALID_INPUT_MSG % (calling_fn, calling_lineno, calling_module, detail))
+
+
 def parent_fn_mod_2step():
     """
     This function finds the calling module, file, and line number 2 steps prior to the current function.
@@ -262,7 +329,8 @@ def parent_fn_mod_2step():
     Parameters:
     :return: calling module name, function name, and line number for 2 previous function calls ('2step')
     """
-    return stack()[2].filename, stack()[2].function, stack()[2].lineno
+    frame = _getframe(2)
+    return frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno
 
 
 def parent_fn_mod_3step():
@@ -272,4 +340,5 @@ def parent_fn_mod_3step():
     Parameters:
     :return: calling module name, function name, and line number for 3 previous function calls ('3step')
     """
-    return stack()[3].filename, stack()[3].function, stack()[3].lineno
\ No newline at end of file
+    frame = _getframe(3)
+    return frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno
\ No newline at end of file
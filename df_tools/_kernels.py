@@ -0,0 +1,110 @@
+# _kernels.py
+
+"""
+This module provides compiled kernels for numerical reductions used by other df_tools modules. The kernels are
+compiled with numba, which is an optional dependency: if numba is not installed, HAS_NUMBA is False, the kernels
+are not defined, and the calling functions fall back to their pandas/numpy implementations.
+
+Functions:
+use_numba, col_absmax, row_nanmean.
+
+Please see the doc strings of individual functions for further information.
+"""
+
+import numpy as np
+import threading
+
+try:
+    from numba import njit, prange
+except ImportError:
+    HAS_NUMBA = False
+else:
+    HAS_NUMBA = True
+
+__all__ = ['HAS_NUMBA',
+           'NUMBA_MIN_SIZE',
+           'use_numba',
+           'col_absmax',
+           'row_nanmean']
+
+# Minimum number of array elements for which the compiled kernels are used. For smaller arrays, the overhead of
+# starting the parallel threads outweighs the gain over the pandas/numpy implementations.
+NUMBA_MIN_SIZE = 100000
+# Array dtypes the kernels are compiled for.
+_KERNEL_DTYPES = (np.float32, np.float64)
+# The kernels start their own parallel threads, and numba's threading layers abort or hang when parallel kernels are
+# launched from several threads at once. The public kernel functions therefore run one kernel at a time under this
+# lock, so they are safe to call from any thread.
+_KERNEL_LOCK = threading.Lock()
+
+
+def use_numba(arr):
+    """
+    This function checks whether the compiled kernels should be used for an array: numba must be installed, the array
+        must be 2D, contain float32 or float64 values in native byte order (numba can't compile for float16 or
+        byte-swapped arrays), and it must have at least NUMBA_MIN_SIZE elements.
+
+    Parameters:
+    :param arr: numpy array to be processed.
+    :return: True if the compiled kernels should be used for arr, False otherwise.
+    """
+    return (HAS_NUMBA and arr.dtype in _KERNEL_DTYPES and arr.dtype.isnative and arr.ndim == 2
+            and arr.size >= NUMBA_MIN_SIZE)
+
+
+if HAS_NUMBA:
+    def col_absmax(arr):
+        """
+        This function finds the maximum absolute value of each column of a 2D float array, fusing abs and max into a
+            single pass over the data, with the columns processed in parallel. NaNs are skipped, and columns containing
+            only NaNs give 0.
+
+        Parameters:
+        :param arr: 2D numpy float array.
+        :return: out: 1D numpy float array, of the same dtype as arr, containing the maximum absolute value of each
+            column of arr.
+        """
+        with _KERNEL_LOCK:
+            return _col_absmax(arr)
+
+    @njit(parallel=True, cache=True)
+    def _col_absmax(arr):
+        n_rows, n_cols = arr.shape
+        out = np.empty(n_cols, dtype=arr.dtype)
+        for j in prange(n_cols):
+            max_abs = 0.0
+            for i in range(n_rows):
+                val = abs(arr[i, j])
+                # Comparisons with NaN are False, so NaNs are skipped.
+                if val > max_abs:
+                    max_abs = val
+            out[j] = max_abs
+        return out
+
+    def row_nanmean(arr):
+        """
+        This function finds the mean of each row of a 2D float array, skipping NaNs, with the rows processed in
+            parallel. Rows containing only NaNs give NaN. The sums are accumulated in double precision.
+
+        Parameters:
+        :param arr: 2D numpy float array.
+        :return: out: 1D numpy float array, of the same dtype as arr, containing the mean of each row of arr.
+        """
+        with _KERNEL_LOCK:
+            return _row_nanmean(arr)
+
+    @njit(parallel=True, cache=True)
+    def _row_nanmean(arr):
+        n_rows, n_cols = arr.shape
+        out = np.empty(n_rows, dtype=arr.dtype)
+        for i in prange(n_rows):
+            row_sum = 0.0
+            count = 0
+            for j in range(n_cols):
+                val = arr[i, j]
+                # NaN is the only value not equal to itself.
+                if val == val:
+                    row_sum += val
+                    count += 1
+            out[i] = row_sum / count if count > 0 else np.nan
+        return out
@@ -14,8 +14,17 @@ See doc strings of the individual functions for further information.
 """
 
 import df_tools._err_check as _ec
+import df_tools._kernels as _kernels
+import numpy as np
 import pandas as pd
 
+try:
+    import bottleneck as bn
+except ImportError:
+    HAS_BOTTLENECK = False
+else:
+    HAS_BOTTLENECK = True
+
 __all__ = ['idx0',
            'avg_cols',
            'avg_rows',
@@ -27,7 +36,7 @@ __all__ = ['idx0',
            'norm_cols_all']
 
 
-def idx0(df):
+def idx0(df, copy=True):
     """
     This function subtracts the DataFrame's first index value from all values in the index. This was designed
         with the aim of create a "t_0" (or "time elapsed") time series - that is, a time series where the first
@@ -37,12 +46,17 @@ def idx0(df):
 
     Parameters:
     :param df: pandas DataFrame for which the index is to be offset.
+    :param copy: If True (default), the returned DataFrame holds a copy of the data. If False, only the index is
+        replaced and the data is shared with df, which avoids copying it, but modifying values in the returned
+        DataFrame then also modifies df.
     :return: pandas DataFrame with offset index.
     """
     # Check to make sure index values are numeric and in a pandas DataFrame.
     _ec.check_dfs(values=[df])
     _ec.check_numeric(values=df.index.values)
-    df_idx0 = df.copy()
+    _ec.check_bool(values=[copy])
+    # Only the index changes, so with copy=False a shallow copy (new index, shared data) is enough.
+    df_idx0 = df.copy(deep=copy)
     df_idx0.index = (df.index.values - df.index.values[0])
 
     return df_idx0
@@ -61,8 +75,9 @@ def avg_cols(df):
     # Check to make sure passed object is a pandas DataFrame
     _ec.check_dfs(values=[df])
 
-    df_avgs = pd.DataFrame({'Averages': df.mean(axis=0)},
-                           index=df.columns.values)
+    # The Series of column means is already indexed by the column names, so it is turned into the returned DataFrame
+    # directly instead of building a new index.
+    df_avgs = _nanreduce(df, how='mean', axis=0).rename('Averages').to_frame()
     return df_avgs
 
 
@@ -78,38 +93,43 @@ def avg_rows(df):
     # check to make sure the passed object is a pandas DataFrame
     _ec.check_dfs(values=[df])
 
-    df_avgs = pd.DataFrame({'Averages': df.mean(axis=1)},
-                           index=df.column.values)
+    # The Series of row means is already indexed by the DataFrame's index, so it is turned into the returned DataFrame
+    # directly.
+    df_avgs = _nanreduce(df, how='mean', axis=1).rename('Averages').to_frame()
 
     return df_avgs
 
 
-def drop_cols(df, cols2drop=[""]):
+def drop_cols(df, cols2drop=[""], inplace=True):
     """
-    This function drops a list of columns from a pandas DataFrame.
+    This function drops a list of columns from a pandas DataFrame. Names in cols2drop that are not columns of the
+        DataFrame are ignored.
 
     Parameters:
     :param df: DataFrame from which to drop columns
-    :return:
+    :param cols2drop: List of column names (strings) to drop.
+    :param inplace: The option whether or not to drop the columns in place. If True, df is modified and 0 is returned.
+        If False, a new DataFrame without the columns is returned and df is preserved.
+    :return: 0 if inplace is True, otherwise the new DataFrame without the dropped columns.
     """
-    # Check data types to prevent errors in column dropping loop.
+    # Check data types to prevent errors when dropping columns.
     _ec.check_ls(ls=cols2drop)
     _ec.check_dfs(values=[df])
     _ec.check_string(values=cols2drop)
+    _ec.check_bool(values=[inplace])
 
-    cols_dropped = 0
-    for col in cols2drop:
-        if col in df.columns:
-            df.drop(col, axis=1, inplace=True)
-            cols_dropped += 1
-        else:
-            pass
-    print('Number of columns dropped from DataFrame: %i' % cols_dropped)
-
-    return 0
+    # Mark the columns to drop with a single hash-based lookup of all column labels in cols2drop, so that they are all
+    # dropped at once rather than rebuilding the DataFrame once per column.
+    drop_mask = df.columns.isin(cols2drop)
+    print('Number of columns dropped from DataFrame: %i' % np.count_nonzero(drop_mask))
+    if inplace:
+        df.drop(columns=df.columns[drop_mask], inplace=True)
+        return 0
+    else:
+        return df.loc[:, ~drop_mask]
 
 
-def top_series_mean(df, n_series=10):
+def top_series_mean(df, n_series=10, col_means=None):
     """
     This function takes a pandas DataFrame as input and then selects the top [n_series] series (i.e., columns),
         based on the average value of the column over all indices. A smaller DataFrame with [n_series] number of
@@ -121,6 +141,10 @@ def top_series_mean(df, n_series=10):
     :param df: A pandas DataFrame from which the series with the highest values, by column mean, are returned.
     :param n_series: The user-specified number of time series to choose as the 'top' time series; that is, the time
         series with the top [n_series] average values in the set.
+    :param col_means: Optional pandas Series of the column means of df (i.e., df.mean(axis=0)), indexed by column name.
+        If the same DataFrame is passed to several functions (e.g., top_series_mean and top_series_quantile), the means
+        can be computed once and passed to each, rather than being recomputed in every call. By default (None), the
+        means are computed from df.
     :return:df_top: The returned pandas DataFrame that is a subset of the original DataFrame and contains [n_series]
         columns with the highest averages (on a column-wise basis) in the original set.
             :max_idx_list: The indices of the maximum average values, as found in df_avg, the average values of the
@@ -131,16 +155,11 @@ def top_series_mean(df, n_series=10):
     _ec.check_int(values=[n_series])
 
     # Create list of indices (columns) that contain the n_series highest average values in order
-    # to later make the returned df_top DataFrame.
-    max_idx_list = []
-    df_avg = df.mean(axis=0)
-
-    for i in range(0, n_series):
-        max_idx_list.append(df_avg.idmax())
-        df_avg.drop(df_avg.idmax(), axis=0, inplace=True)
+    # to later make the returned df_top DataFrame. nlargest selects them with one partial sort.
+    max_idx_list = _col_means(df, col_means).nlargest(n_series).index.tolist()
 
     # Create df_top to return, along with the indices labels of the maximum average values.
-    df_top = df.ix[:, max_idx_list]
+    df_top = df.loc[:, max_idx_list]
 
     return df_top, max_idx_list
 
@@ -167,32 +186,28 @@ def top_series_max(df, n_series=10):
     _ec.check_int(values=[n_series])
 
     # Create list of indices (columns) that contain the n_series highest maximum values in order
-    # to later make the returned df_top DataFrame.
-    max_idx_list = []
-    df_max = df.max(axis=0)
-
-    for i in range(0, n_series):
-        max_idx = df_max.idxmax()
-        max_idx_list.append(df_max.idxmax())
-        df_max.drop(df_max.idxmax(), axis=0, inplace=True)
+    # to later make the returned df_top DataFrame. nlargest selects them with one partial sort.
+    max_idx_list = _nanreduce(df, how='max', axis=0).nlargest(n_series).index.tolist()
 
     # Create df_top to return, along with the indices labels of the maximum values.
-    df_top = df.ix[:, max_idx_list]
+    df_top = df.loc[:, max_idx_list]
 
     return df_top, max_idx_list
 
 
-def top_series_quantile(df, quant=0.9):
+def top_series_quantile(df, quant=0.9, col_means=None):
     """
     This function takes a pandas DataFrame and returns the top [quant] quantile of the time series, based
         on the mean value of each column (averaged along index). Originally designed to find the [quantile] percentile
-        of time series, based on average value, assuming that all time series units are on the same scale. Uses the
-        pandas built-in method, 'df.quantile(percentile)' to find the [quant] percentile.
+        of time series, based on average value, assuming that all time series units are on the same scale. Uses
+        numpy.nanpercentile on the column means to find the [quant] percentile.
 
     Parameters:
     :param df: A pandas DataFrame, containing the time series from which those with the top [quant] percentile of
         mean values are selected and returned.
     :param quant: The quantile/percentile to select from the time series present in param df.
+    :param col_means: Optional pandas Series of the column means of df (i.e., df.mean(axis=0)), indexed by column name.
+        See top_series_mean. By default (None), the means are computed from df.
     :return: df_quant: The top [quant] percentile of time series (columns) from the original DataFrame, based on the
         mean values of the columns.
     """
@@ -200,23 +215,17 @@ def top_series_quantile(df, quant=0.9):
     _ec.check_dfs(values=[df])
     _ec.check_numeric(values=[quant])
     _ec.check_threshold(values=[quant], thresh=1.0, how='under')
-    # Take average of original DataFrame for processing and make a 'quant_index_list' to be able to create a new
-    # returnable DataFrame from the original using a mask.
-    quant_index_list = []
-    df_proc = df.mean(axis=0)
-
-    quantile = df_proc.quantile(quant)
-    for i in df_proc.index:
-        if df_proc[i] > quantile:
-            quant_index_list.append(i)
-        else:
-            pass
-    df_quant = df[quant_index_list]
+    # Take average of original DataFrame for processing and compare all column means to the quantile at once to get
+    # a boolean mask for creating a new returnable DataFrame from the original. nanpercentile skips NaN means, as
+    # Series.quantile does.
+    means = _col_means(df, col_means).to_numpy()
+    quantile = np.nanpercentile(means, quant * 100)
+    df_quant = df.loc[:, means > quantile]
 
     return df_quant
 
 
-def norm_cols_each(df):
+def norm_cols_each(df, dtype=None):
     """
     This function takes a pandas DataFrame and normalizes each column to the maximum absolute value in that column,
         resulting in values ranging -1 to 1. This was originally designed for normalizing multiple time series within
@@ -225,16 +234,18 @@ def norm_cols_each(df):
 
     Parameters:
     :param df: Expected: A pandas DataFrame containing the columns to be normalized.
+    :param dtype: Optional float dtype in which the normalized values are computed and returned (e.g., numpy.float32
+        to halve the memory of the result). By default (None), the dtype follows from dividing the DataFrame's values.
     :return: df_norm: A new DataFrame with each column normalized to its maximum value. Values will be in the range
-        -1 to 1.
+        -1 to 1. Columns containing only zeros are returned unchanged.
     """
-    # Check for correct data type of df (pandas.DataFrame) to prevent subsequent errors.
+    # Check for correct data type of df (pandas.DataFrame), and that dtype (if given) is a float dtype, to prevent
+    # subsequent errors.
     _ec.check_dfs(values=[df])
+    if dtype is not None:
+        _ec.check_float_dtype(dtype=dtype)
 
-    df_norm = df.copy(deep=True)
-    for col in df.axes[1]:
-        max_abs_val = max(abs(df[col].max()), abs(df[col].min()))
-        df_norm[col] = df_norm[col] / max_abs_val
+    df_norm = _norm_cols_each(df, dtype=dtype)
     return df_norm
 
 
@@ -243,7 +254,8 @@ def norm_cols_all(df):
     This takes a pandas DataFrame and normalizes each column to the maximum absolute value present in all columns,
         resulting in values ranging -1 to 1. This was originally designed for normalizing multiple time series within
         a DataFrame to a maximum of 1 so that they can be plotted on the same scale for qualitative comparison.
-        You may encounter an error if non-numeric values are present in the DataFrame.
+        NaNs are ignored when finding the maximum absolute value. You may encounter an error if non-numeric values are
+        present in the DataFrame.
 
     Parameters:
     :param df: pandas DataFrame in which to normalize the columns.
@@ -253,7 +265,94 @@ def norm_cols_all(df):
     # Check df type (expected: pandas DataFrame) to prevent errors during normalization.
     _ec.check_dfs(values=[df])
 
-    max_abs_val = max(abs(df.values.max()), abs(df.values.min()))
-    df_norm = df / max_abs_val
+    # Find the maximum absolute value with one pass over the underlying array, rather than separate passes for the
+    # maximum and the minimum.
+    arr = df.to_numpy()
+    max_abs_val = np.nanmax(np.abs(arr))
+    # Divide the array directly, rather than going through DataFrame division, and let the new DataFrame take over the
+    # result without another copy. An all-zero DataFrame is divided by 1 (left as zeros). The result is written in
+    # column-major (Fortran) order so that each column of the returned DataFrame is contiguous in memory.
+    df_norm = pd.DataFrame(np.divide(arr, max_abs_val or 1.0, order='F'), index=df.index, columns=df.columns,
+                           copy=False)
 
     return df_norm, max_abs_val
+
+
+def _col_means(df, col_means=None):
+    """
+    This function returns the column means of a pandas DataFrame, reusing precomputed means if they are given. Given
+        means are aligned to the columns of df, so that their order does not matter, and columns missing from them
+        are given NaN.
+
+    Parameters:
+    :param df: pandas DataFrame for which the column means are returned.
+    :param col_means: pandas Series of precomputed column means, indexed by column name, or None.
+    :return: pandas Series of the column means of df, indexed by column name.
+    """
+    if col_means is None:
+        return _nanreduce(df, how='mean', axis=0)
+    return col_means.reindex(df.columns)
+
+
+def _nanreduce(df, how='mean', axis=0):
+    """
+    This function computes the mean or maximum of a pandas DataFrame along an axis, skipping NaNs (as DataFrame.mean
+        and DataFrame.max do by default). If all columns share one numpy float dtype, the reduction is done on the
+        underlying array directly, bypassing the pandas reduction machinery: row means of large arrays use the
+        compiled kernel if numba is installed, and otherwise bottleneck's nanmean/nanmax are used for float32/float64
+        arrays if bottleneck is installed. In all other cases (including pandas extension dtypes such as Float64, whose arrays hold pd.NA),
+        the pandas method is used.
+
+    Parameters:
+    :param df: pandas DataFrame to reduce.
+    :param how: The reduction to compute, 'mean' or 'max'.
+    :param axis: The axis along which to reduce: 0 for one value per column, 1 for one value per row.
+    :return: pandas Series of the reduced values, indexed by the column names (axis=0) or the row index (axis=1).
+    """
+    if df.size:
+        dtypes = set(df.dtypes)
+        dtype = dtypes.pop() if len(dtypes) == 1 else None
+        if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+            arr = df.to_numpy()
+            if how == 'mean' and axis == 1 and _kernels.use_numba(arr):
+                return pd.Series(_kernels.row_nanmean(arr), index=df.index, copy=False)
+            # bottleneck only has fast paths for float32 and float64 (it hands float16 arrays back to numpy, which
+            # warns on all-NaN slices), so other float dtypes are left to pandas.
+            if HAS_BOTTLENECK and dtype in (np.float32, np.float64):
+                reduce_fn = bn.nanmean if how == 'mean' else bn.nanmax
+                return pd.Series(reduce_fn(arr, axis=axis), index=df.axes[1 - axis], copy=False)
+    return getattr(df, how)(axis=axis)
+
+
+def _norm_cols_each(df, dtype=None, use_kernel=True):
+    """
+    This function normalizes each column of a pandas DataFrame to its maximum absolute value for norm_cols_each and
+        norm_cols_each_ls, without checking the input.
+
+    Parameters:
+    :param df: pandas DataFrame containing the columns to be normalized.
+    :param dtype: Optional float dtype in which the normalized values are computed and returned. See norm_cols_each.
+    :param use_kernel: If False, the compiled kernel is never used, e.g. when the function is called from a pool of
+        threads that would otherwise all queue up on the kernel lock.
+    :return: df_norm: A new DataFrame with each column normalized to its maximum value.
+    """
+    # DataFrames without rows, or with pandas extension dtypes (e.g. Int64, whose arrays hold pd.NA), can't be reduced
+    # on the raw array, so they are normalized with pandas methods instead, keeping their dtypes.
+    if df.shape[0] == 0 or not all(isinstance(col_dtype, np.dtype) for col_dtype in df.dtypes):
+        df_norm = df / df.abs().max(axis=0).replace(0, 1)
+        return df_norm if dtype is None else df_norm.astype(dtype)
+    # Find the maximum absolute value of every column, skipping NaNs (as DataFrame.max does by default). For large
+    # float DataFrames, the compiled kernel does this in one parallel pass, if numba is available. Otherwise, it is
+    # found from the column maxima and minima of the underlying array, which avoids allocating np.abs(arr).
+    arr = df.to_numpy()
+    if use_kernel and _kernels.use_numba(arr):
+        max_abs_vals = _kernels.col_absmax(arr)
+    else:
+        max_abs_vals = np.fmax(np.abs(np.fmax.reduce(arr, axis=0)), np.abs(np.fmin.reduce(arr, axis=0)))
+    # All-zero columns are divided by 1 (left as zeros) rather than producing NaNs. The whole array is divided at once
+    # into a single column-major (Fortran) buffer, so that each column of the returned DataFrame is contiguous in
+    # memory, and the DataFrame takes the buffer over without another copy.
+    max_abs_vals[max_abs_vals == 0] = 1.0
+    arr_norm = np.divide(arr, max_abs_vals, order='F', dtype=dtype)
+    df_norm = pd.DataFrame(arr_norm, index=df.index, columns=df.columns, copy=False)
+    return df_norm
@@ -17,8 +17,11 @@ See the doc strings for individual functions for further information.
 """
 
 from df_tools.df_utils import *
+from df_tools.df_utils import _norm_cols_each
 import df_tools._err_check as _ec
-import sys
+from concurrent.futures import ThreadPoolExecutor
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -40,38 +43,45 @@ __all__ = ['create_df_ls',
            'norm_cols_all_ls']
 
 
-def create_df_ls(flist=[""], indir=""):
+def create_df_ls(flist=[""], indir="", n_jobs=-1):
     """
     This function takes a list of string values that are the paths and file names to csv files. The csv files are
-        then individually loaded into pandas DataFrames and returned in a list containing a DataFrame for each csv
-        in flist.
+        then loaded into pandas DataFrames (concurrently, using a pool of threads) and returned in a list containing a
+        DataFrame for each csv in flist that was found. The first column of each csv is used as the index.
 
     Parameters:
     :param flist: A list of string values that contain the names of csv files to be loaded into pandas DataFrames
     :param indir: A string value that is the optional base directory of all of the csv files. If the full path for
         each file is included in flist, then this parameter should be left blank (""). Otherwise, the base directory
         where the csv files reside should be used.
+    :param n_jobs: The number of threads used to load the csv files. If n_jobs < 1 (the default is -1), one thread per
+        CPU is used. With n_jobs=1, the files are loaded one after another.
     :return: df_ls: A list of pandas DataFrames loaded from the csvs specified in flist.
     """
     # Check passed parameter values to prevent error in future.
     _ec.check_ls(ls=flist)
     _ec.check_string(values=flist)
     _ec.check_string(values=[indir])
+    _ec.check_int(values=[n_jobs])
 
-    df_ls = []
+    found_ls = []
     for f in flist:
         file = Path(indir+f)
         if file.is_file():
-            df = pd.DataFrame.from_csv(indir+f)
-            df_ls.append(df)
-            print('file "%s" added to list.' % f)
+            found_ls.append(f)
         else:
             print("File '%s' not found. Not included in DataFrame list." % (indir+f))
 
+    # Load the csv files concurrently. Most of the time is spent in file I/O and the pandas C parser, which release
+    # the GIL, so threads overlap the reads. The DataFrames are returned in the order of flist.
+    df_ls = _map_ls(lambda f: pd.read_csv(indir+f, index_col=0, parse_dates=True), found_ls, n_jobs=n_jobs)
+    for f in found_ls:
+        print('file "%s" added to list.' % f)
+
     return df_ls
 
 
-def idx0_ls(df_ls):
+def idx0_ls(df_ls, copy=True):
     """
     This function subtracts each DataFrame's first index value from all values in the index. This was designed
         with the aim of create a "t_0" (or "time elapsed") time series - that is, a time series where the first
@@ -81,17 +91,22 @@ def idx0_ls(df_ls):
 
     Parameters:
     :param df_ls: A list of pandas DataFrames for which the index of each is to be offset by the first index value.
+    :param copy: If True (default), the returned DataFrames hold copies of the data. If False, only the index is
+        replaced and the data is shared with the original DataFrames, which avoids copying it, but modifying values
+        in a returned DataFrame then also modifies the original.
     :return: df_t0_ls: A list of pandas DataFrames with offset indices.
     """
     # Check to make sure index values are numeric and in a pandas DataFrame.
     _ec.check_ls(ls=df_ls)
     _ec.check_dfs(values=df_ls)
+    _ec.check_bool(values=[copy])
 
     df_idx0_ls = []
     for df in df_ls:
         _ec.check_numeric(values=df.index.values)
-        df_idx0 = df.copy()
-        df_idx0.index = (df.index.values - df.index.values[0])
+        # Only the index changes, so with copy=False a shallow copy (new index, shared data) is enough.
+        df_idx0 = df.copy(deep=copy)
+        df_idx0.index = df.index - df.index[0]
         df_idx0_ls.append(df_idx0)
 
     return df_idx0_ls
@@ -119,23 +134,20 @@ def drop_cols_df_ls(df_ls, cols2drop=['none'], inplace=True):
 
     if not inplace:
         df_dropped_ls = []
-    for df, df_num in zip(df_ls, range(len(df_ls))):
-        cols_dropped = 0
-        if not inplace:
-            df_dropped = df.copy(deep=True)
-        for col in cols2drop:
-            if col in df.columns:
-                if inplace:
-                    df.drop(col, axis=1, inplace=inplace)
-                    cols_dropped += 1
-                else:
-                    df_dropped = df_dropped.drop(col, axis=1, inplace=inplace)
-                    cols_dropped += 1
-            else:
+    # The names to drop are the same for every DataFrame, so they are converted to an Index only once.
+    cols2drop_idx = pd.Index(cols2drop)
+    for df_num, df in enumerate(df_ls):
+        # Mark the columns to drop with a single hash-based lookup of all column labels in cols2drop, so that they are
+        # all dropped at once rather than rebuilding the DataFrame once per column.
+        drop_mask = df.columns.isin(cols2drop_idx)
+        for col, col_present in zip(cols2drop, cols2drop_idx.isin(df.columns)):
+            if not col_present:
                 print('Column %s not present in DataFrame # %i. Proceeding to next in list.' % (col, df_num))
-        if not inplace:
-            df_dropped_ls.append(df_dropped)
-        print('Number of columns dropped from DataFrame #%i: %i' % (df_num, cols_dropped))
+        if inplace:
+            df.drop(columns=df.columns[drop_mask], inplace=True)
+        else:
+            df_dropped_ls.append(df.loc[:, ~drop_mask])
+        print('Number of columns dropped from DataFrame #%i: %i' % (df_num, np.count_nonzero(drop_mask)))
     if inplace:
         return 0
     else:
@@ -163,10 +175,8 @@ def norm_by_factors(df_ls, factor_ls=[0.0]):
     _ec.check_dfs(values=df_ls)
     _ec.check_numeric(values=factor_ls)
 
-    df_ls_out = df_ls.copy()
-    for df_in, factor, df_out, df_num in zip(df_ls, factor_ls, df_ls_out, range(len(df_ls))):
-        for col in range(0, len(df_in.columns)):
-            df_out.ix[:, col] = df_in.ix[:, col] / factor
+    # Each factor is a scalar, so every DataFrame is normalized with a single division over all of its columns.
+    df_ls_out = [df / factor for df, factor in zip(df_ls, factor_ls)]
     return df_ls_out
 
 
@@ -190,12 +200,16 @@ def df_col_avg_sum(df_ls, df_name_ls=[]):
     _ec.check_dfs(values=df_ls)
     _ec.check_string(values=df_name_ls)
 
-    avgsums = []
-    for df, df_name, df_num in zip(df_ls, df_name_ls, range(len(df_ls))):
-        avgsum = df.sum(axis=0).mean(axis=0)
-        avgsums.append(avgsum)
-    # Create single DataFrame with average sums of each DataFrame in the first column.
-    df_out = pd.DataFrame({"Dataset Name": df_name_ls,
+    avgsums = np.empty(len(df_ls), dtype=np.float64)
+    for i, df in enumerate(df_ls):
+        # The mean of the column sums equals the sum of all values divided by the number of columns, which needs only
+        # one reduction over the underlying array. nansum skips NaNs, as DataFrame.sum does by default. DataFrames
+        # without columns get NaN (the mean of no column sums) without a division by zero.
+        arr = df.to_numpy()
+        avgsums[i] = np.nansum(arr) / arr.shape[1] if arr.shape[1] else np.nan
+    # Create single DataFrame with average sums of each DataFrame in the first column. Both columns are passed as
+    # typed arrays, so no dtype inference is needed during construction.
+    df_out = pd.DataFrame({"Dataset Name": pd.array(df_name_ls, dtype="string"),
                            "Mean of Column Sums": avgsums})
     return df_out
 
@@ -215,44 +229,50 @@ def find_min_rows(df_ls, max_len=99999999999):
     _ec.check_dfs(values=df_ls)
     _ec.check_int(values=[max_len])
 
-    nrows_min = max_len
-    for df in df_ls:
-        if df.shape[0] < nrows_min:
-            nrows_min = df.shape[0]
-        else:
-            pass
+    nrows_min = min(min((df.shape[0] for df in df_ls), default=max_len), max_len)
     return nrows_min
 
 
-def truncate_dfs(df_ls, min_rows=1000):
+def truncate_dfs(df_ls, min_rows=1000, inplace=True):
     """
     This function takes a list of pandas DataFrames and truncates them to the number of rows specified by parameter
-        min_rows. By default, it truncates the DataFrames to 1000 rows.
+        min_rows. By default, it truncates the DataFrames to 1000 rows in place. With inplace=False, the truncated
+        DataFrames are returned as row slices of the originals, which avoids rebuilding each DataFrame without the
+        dropped rows.
 
     Parameters:
     :param df_ls: List of pandas DataFrames which will be truncated.
     :param min_rows: The number of rows to truncate each DataFrame to.
-    :return: Nothing. The original DataFrames are modified in-place.
+    :param inplace: The option whether or not to truncate the DataFrames in place. If True, the original DataFrames
+        are modified. If False, a new list of truncated DataFrames is returned, and the original DataFrames keep all
+        their rows.
+    :return: If inplace == True, nothing. The original DataFrames are modified in-place. Otherwise, df_trunc_ls is
+        returned, which is a list of the DataFrames truncated to min_rows rows. To avoid copying the data, these share
+        their data with the original DataFrames, so copy them before modifying values if the originals must be
+        preserved.
     """
     # Check that data types are those expected.
     _ec.check_ls(ls=df_ls)
     _ec.check_int(values=[min_rows])
     _ec.check_dfs(values=df_ls)
+    _ec.check_bool(values=[inplace])
 
-    for df in df_ls:
-        cut = df.shape[0] - min_rows
-        if cut > 0:
-            df.drop(df.index[-cut:], inplace=True)
-        else:
-            pass
-    return 0
+    if inplace:
+        for df in df_ls:
+            if df.shape[0] > min_rows:
+                df.drop(df.index[min_rows:], inplace=True)
+        return 0
+    else:
+        df_trunc_ls = [df.iloc[:min_rows] for df in df_ls]
+        return df_trunc_ls
 
 
-def dropna_df_ls(df_ls, axis=0, rm_method='any', inplace=True):
+def dropna_df_ls(df_ls, axis=0, rm_method='any', inplace=True, n_jobs=1):
     """
     This function works as a wrapper to the built in pandas DataFrame.dropna(), performing dropna on each member of a
-        list of DataFrames. Dropna is performed along axis 0 (row dimension for a 2D df) and NaNs are dropped in place
-        by default, such that the original DataFrames are modified. If
+        list of DataFrames. By default, dropna is performed along axis 0 (row dimension for a 2D df) and NaNs are
+        dropped in place, such that the original DataFrames are modified. If inplace is False, new DataFrames are
+        returned; those with a single numeric dtype are stored in column-major order.
 
     Parameters:
     :param df_ls: List of pandas DataFrames on which the DataFrame.dropna() function is
@@ -261,6 +281,8 @@ def dropna_df_ls(df_ls, axis=0, rm_method='any', inplace=True):
     :param rm_method: Corresponds to the value for the keyword 'how' in the pandas DataFrame.dropna().
     :param inplace: A choice whether to drop nans in place or to return a copy of the list of DataFrames with the
         nans removed as specified by axis and rm_method.
+    :param n_jobs: The number of threads over which the DataFrames are processed. By default (n_jobs=1), they are
+        processed one after another. If n_jobs < 1, one thread per CPU is used.
     :return: If inplace == True, DataFrames are modified in place, and nothing is returned. Otherwie, df_no_nan_ls
         is returned, which is a list of the DataFrames with nans removed as specified by axis and rm_method parameters.
     """
@@ -271,15 +293,29 @@ def dropna_df_ls(df_ls, axis=0, rm_method='any', inplace=True):
     _ec.param_exists_in_set(value=axis, val_set=[0, 1])
     _ec.param_exists_in_set(value=rm_method, val_set=['any', 'all'])
     _ec.param_exists_in_set(value=inplace, val_set=[True, False])
-
-    df_no_nan_ls = []
-    for df in df_ls:
-        print('shape before dropna:', df.shape)
-        if inplace:
-            df.dropna(axis=0, how=rm_method, inplace=inplace)
-        else:
-            df_dropna_temp = df.dropna(axis=0, how=rm_method, inplace=inplace)
-            df_no_nan_ls.append(df_dropna_temp)
+    _ec.check_int(values=[n_jobs])
+
+    def dropna_df(df):
+        df_no_nan = df.dropna(axis=axis, how=rm_method)
+        # dropna may return a numeric DataFrame whose columns are strided in memory. If so, store it in
+        # column-major order so that later column-wise reductions read contiguous memory. Only frames with a single
+        # numeric dtype are converted, since to_numpy() is then a view rather than a copy.
+        dtypes = set(df_no_nan.dtypes)
+        if len(dtypes) == 1 and dtypes.pop().kind in 'biufc':
+            arr = df_no_nan.to_numpy()
+            if not arr.flags.f_contiguous:
+                df_no_nan = pd.DataFrame(np.asfortranarray(arr), index=df_no_nan.index, columns=df_no_nan.columns,
+                                         copy=False)
+        return df_no_nan
+
+    shapes_before = [df.shape for df in df_ls]
+    if inplace:
+        _map_ls(lambda df: df.dropna(axis=axis, how=rm_method, inplace=True), df_ls, n_jobs=n_jobs)
+        df_no_nan_ls = df_ls
+    else:
+        df_no_nan_ls = _map_ls(dropna_df, df_ls, n_jobs=n_jobs)
+    for shape_before, df in zip(shapes_before, df_no_nan_ls):
+        print('shape before dropna:', shape_before)
         print('shape after dropna:', df.shape)
     if inplace:
         return 0
@@ -304,7 +340,7 @@ def set_indices_ls(df_ls, index_name=''):
     _ec.check_dfs(values=df_ls)
     _ec.check_string(values=[index_name])
 
-    for df, df_num in zip(df_ls, range(0, len(df_ls))):
+    for df_num, df in enumerate(df_ls):
         if index_name in df.columns:
             df.set_index(index_name, inplace=True)
         else:
@@ -343,16 +379,10 @@ def top_series_mean_ls(df_ls, n_series=10):
     df_top_ls = []
     max_idx_ls_all = []
     for df in df_ls:
-        max_idx_list = []
-        df_avg = df.mean(axis=0)
-        # Loop through the averaged DataFrame, dropping each maximum idx after adding that idx to a list.
-        for i in range(0, n_series):
-            max_idx_list.append(df_avg.idxmax())
-            df_avg.drop(df_avg.idxmax(), axis=0, inplace=True)
-        # Create df_top from max_idx_list to pick the n_series top columns, based on mean values.
-        # df_top = df.ix[:, max_idx_list]
-        # Append to lists that are to be returned.
-        df_top_ls.append(df.ix[:, max_idx_list])
+        # Pick the labels of the n_series largest column means (in descending order) with a single partial sort.
+        max_idx_list = df.mean(axis=0).nlargest(n_series).index.tolist()
+        # Append the top columns and their labels to the lists that are to be returned.
+        df_top_ls.append(df.loc[:, max_idx_list])
         max_idx_ls_all.append(max_idx_list)
 
     return df_top_ls, max_idx_ls_all
@@ -386,23 +416,16 @@ def top_series_max_ls(df_ls, n_series=10):
     df_top_ls = []
     max_idx_ls_all = []
     for df in df_ls:
-        max_idx_list = []
-        df_max = df.max(axis=0)
-        # Loop through average DataFrame to find the top n_series indices, based on maximum values.
-        for i in range(0, n_series):
-            # max_idx = df_max.idxmax()
-            max_idx_list.append(df_max.idxmax())
-            df_max.drop(df_max.idxmax(), axis=0, inplace=True)
-        # Create df_top to return, along with the indices labels of the maximum average values.
-        # df_top = df.ix[:, max_idx_list]
+        # Pick the labels of the n_series largest column maximums (in descending order) with a single partial sort.
+        max_idx_list = df.max(axis=0).nlargest(n_series).index.tolist()
         # Append to list of top DataFrames and list-of-list of top indices for each DataFrame to return.
-        df_top_ls.append(df.ix[:, max_idx_list])
+        df_top_ls.append(df.loc[:, max_idx_list])
         max_idx_ls_all.append(max_idx_list)
 
     return df_top_ls, max_idx_ls_all
 
 
-def top_series_quantile_ls(df_ls, quant=0.75):
+def top_series_quantile_ls(df_ls, quant=0.75, n_jobs=1):
     """
     This function uses the function top_series_quantile from df_utils.py, but applies it to each DataFrame in a lst
         of pandas DataFrames. This will select the columns in a DataFrame whose mean values are above the [quant]
@@ -412,6 +435,8 @@ def top_series_quantile_ls(df_ls, quant=0.75):
     Parameters:
     :param df_ls: A list of pandas DataFrames from which the [quant]x100th percentile of columns will be pulled.
     :param quant: The percentile at which to select only those columns whose mean value is greater.
+    :param n_jobs: The number of threads over which the DataFrames are processed. By default (n_jobs=1), they are
+        processed one after another. If n_jobs < 1, one thread per CPU is used.
     :return: df_percentile_ls: A list of pandas DataFrames of length len(df_ls), which are comprised of only the
         those columns whose values are above the [quant] percentile.
     """
@@ -420,11 +445,10 @@ def top_series_quantile_ls(df_ls, quant=0.75):
     _ec.check_dfs(values=df_ls)
     _ec.check_numeric(values=[quant])
     _ec.check_threshold(values=[quant], thresh=1.0, how='under')
+    _ec.check_int(values=[n_jobs])
 
-    # Create list to put the quantile/percentile DataFrames into
-    df_percentile_ls = []
-    for df_idx in range(0, len(df_ls)):
-        df_percentile_ls.append(top_series_quantile(df=df_ls[df_idx], quant=quant))     # Append quantile df to new list
+    # Create list of the quantile/percentile DataFrames. Each DataFrame is processed independently.
+    df_percentile_ls = _map_ls(lambda df: top_series_quantile(df=df, quant=quant), df_ls, n_jobs=n_jobs)
 
     return df_percentile_ls
 
@@ -448,7 +472,9 @@ def concat_ls(df_ls1, df_ls2, axis=0, join='inner'):
     :param join: Allows user to specify the join parameter for pandas.concat(). Must be compatible with choices
         available within the pandas package.
     :return: df_list: A list of DataFrames where elements are DataFrames from list 1 concatenated onto the corresponding
-        DataFrame from list 2
+        DataFrame from list 2. To avoid copying data, the returned DataFrames may share memory with the DataFrames
+        passed in (if one DataFrame of a pair is empty, the other is returned as is), so copy them before modifying
+        them if the originals must be preserved.
     """
     # Check data types to prevent errors during processing.
     _ec.check_ls(ls=df_ls1)
@@ -477,15 +503,37 @@ def concat_ls(df_ls1, df_ls2, axis=0, join='inner'):
                 print('WARNING: You chose to concatenate in column dimension (side-by-side) with axis=1, but'
                       'some DataFrame pairs have different number of rows.  Proceeding...')
     else:
-        print('ERROR: Parameter axis must be set to 0 or 1')
-        sys.exit()
+        raise _ec.invalid_input_error('Value "%s" not found in set: [0, 1]. Parameter axis must be set to 0 or 1.'
+                                      % (axis,))
 
     for df1, df2 in zip(df_ls1, df_ls2):
-        df_ls_concat.append(pd.concat([df1, df2], axis=axis, join=join))
+        df_ls_concat.append(_concat_pair(df1, df2, axis=axis, join=join))
 
     return df_ls_concat
 
 
+def _concat_pair(df1, df2, axis=0, join='inner'):
+    """
+    This function concatenates a pair of DataFrames for concat_ls. If one DataFrame of the pair is empty along the
+        concatenation axis and has the same labels as the other along the remaining axis, concatenation would just
+        reproduce the other DataFrame, so it is returned directly and pandas.concat is skipped. Otherwise the pair
+        is concatenated with pandas.concat.
+
+    Parameters:
+    :param df1: DataFrame on which to concatenate df2.
+    :param df2: DataFrame to concatenate onto df1.
+    :param axis: The axis along which the DataFrames will be concatenated (0 or 1).
+    :param join: The join method for pandas.concat ('inner' or 'outer').
+    :return: The concatenated DataFrame. May share memory with df1 or df2.
+    """
+    other_axis = 1 - axis
+    if df2.shape[axis] == 0 and df2.axes[other_axis].equals(df1.axes[other_axis]):
+        return df1
+    if df1.shape[axis] == 0 and df1.axes[other_axis].equals(df2.axes[other_axis]):
+        return df2
+    return pd.concat([df1, df2], axis=axis, join=join)
+
+
 def concat_trans_ls(df_ls1, df_ls2, axis=0, join='inner', pad=True, rep_colnames=True, pad_name=''):
     """
     This function takes two lists of pandas DataFrames and concatenates them, after transposing the second.
@@ -529,39 +577,40 @@ def concat_trans_ls(df_ls1, df_ls2, axis=0, join='inner', pad=True, rep_colnames
 
     # Initialize internal function variables and return list
     df_concat_ls = []
-    # check row or column lengths of lists to make sure they're the same.  If not, tell user, but try to proceed
+    # check row or column lengths of lists to make sure they're the same.  If not, tell user, but try to proceed.
+    # The shape of df2.T is df2's shape reversed, so the checks don't need to transpose df2.
     if axis == 0:
         for df1, df2 in zip(df_ls1, df_ls2):
-            if df1.shape[1] != df2.T.shape[1]:
+            if df1.shape[1] != df2.shape[0]:
                 print('WARNING: You chose concatenation in row dimension (i.e., stacking) with parameter axis=0,\n'
                       'but some DataFrame pairs have different numbers of columns.  Proceeding...')
             else:
                 pass
     elif axis == 1:
         for df1, df2 in zip(df_ls1, df_ls2):
-            if df1.shape[0] != df2.T.shape[0]:
+            if df1.shape[0] != df2.shape[1]:
                 print('WARNING: You chose to concatenate in column dimension (side by side) with axis=1, but'
                       'some DataFrame pairs have different number of rows.  Proceeding...')
     else:
-        print('ERROR: Parameter axis must be set to 0 or 1')
-        sys.exit()
+        raise _ec.invalid_input_error('Value "%s" not found in set: [0, 1]. Parameter axis must be set to 0 or 1.'
+                                      % (axis,))
 
-    # Proceed with concatenation
+    # Proceed with concatenation. The pieces of each pair are collected first so that every pair is joined with a
+    # single pandas.concat call.
     for df1, df2 in zip(df_ls1, df_ls2):
+        pieces = [df1]
         # Create pad row if selected, and pad b/t the two DataFrames in current pair
         if pad:
             padding = pd.DataFrame(index=['', pad_name], columns=df1.columns)
             if rep_colnames:
-                padding.values[1] = df1.columns.values
-            else:
-                pass
-            df_concat_ls.append(pd.concat([df1, padding, df2.T], axis=axis, join=join))
-        else:
-            df_concat_ls.append(pd.concat([df1, df2.T], axis=axis, join=join))
+                padding.iloc[1] = df1.columns.values
+            pieces.append(padding)
+        pieces.append(df2.T)
+        df_concat_ls.append(pd.concat(pieces, axis=axis, join=join))
     return df_concat_ls
 
 
-def norm_cols_each_ls(df_ls):
+def norm_cols_each_ls(df_ls, n_jobs=1):
     """
     This function takes a list of pandas DataFrames and normalizes columns to the maximum absolute value in each column,
         resulting in values ranging -1 to 1. This was originally designed for normalizing multiple time series within
@@ -570,20 +619,21 @@ def norm_cols_each_ls(df_ls):
 
     Parameters:
     :param df_ls: A list of pandas DataFrames containing the columns to be normalized.
+    :param n_jobs: The number of threads over which the DataFrames are processed. By default (n_jobs=1), they are
+        processed one after another. If n_jobs < 1, one thread per CPU is used.
     :return: df_norm_ls: A list of new DataFrames with each column normalized to its maximum value. Values will be
-        in the range -1 to 1.
+        in the range -1 to 1. Columns containing only zeros are returned unchanged.
     """
     # Check for correct data type of df (pandas.DataFrame) to prevent subsequent errors.
     _ec.check_ls(ls=df_ls)
     _ec.check_dfs(values=df_ls)
+    _ec.check_int(values=[n_jobs])
 
-    df_norm_ls = []
-    for df in df_ls:
-        df_norm = df.copy(deep=True)
-        for col in df.axes[1]:
-            max_abs_val = max(abs(df[col].max()), abs(df[col].min()))
-            df_norm[col] = df_norm[col] / max_abs_val
-        df_norm_ls.append(df_norm)
+    # The compiled kernel runs its own parallel threads, and only one kernel can run at a time (see
+    # df_tools._kernels), so it is only used if the DataFrames are processed one after another. Otherwise, the threads
+    # would all queue up on the kernel lock.
+    use_kernel = n_jobs == 1 or len(df_ls) <= 1
+    df_norm_ls = _map_ls(lambda df: _norm_cols_each(df, use_kernel=use_kernel), df_ls, n_jobs=n_jobs)
 
     return df_norm_ls
 
@@ -593,12 +643,13 @@ def norm_cols_all_ls(df_ls):
     This takes a list of pandas DataFrames and normalizes each column to the maximum absolute value in all columns,
         resulting in values ranging -1 to 1. This was originally designed for normalizing multiple time series within
         a DataFrame to a maximum of 1 so that they can be plotted on the same scale for qualitative comparison.
-        You may encounter an error if non-numeric values are present in the DataFrame.
+        NaNs are ignored when finding the maximum absolute value. You may encounter an error if non-numeric values are
+        present in the DataFrame.
 
     Parameters:
     :param df_ls: A list of pandas DataFrames in which to normalize the columns.
     :return: df_norm_ls: A new pandas DataFrame with the normalized columns in it.
-             max_in_all_ls: A list of the maximum values present in all columns in each DataFrame.
+             max_in_all_ls: A list of the maximum absolute values present in all columns in each DataFrame.
     """
     # Check df type (expected: pandas DataFrame) to prevent errors during normalization.
     _ec.check_ls(ls=df_ls)
@@ -607,9 +658,37 @@ def norm_cols_all_ls(df_ls):
     df_norm_ls = []
     max_abs_val_ls = []
     for df in df_ls:
-        max_abs_val = max(abs(df.values.max()), abs(df.values.min()))
-        df_norm = df / max_abs_val
+        # Find the maximum absolute value with one pass over the underlying array and divide the array directly,
+        # rather than going through DataFrame division. An all-zero DataFrame is divided by 1 (left as zeros). The
+        # result is written in column-major (Fortran) order so that each column of the returned DataFrame is
+        # contiguous in memory.
+        arr = df.to_numpy()
+        max_abs_val = np.nanmax(np.abs(arr))
+        df_norm = pd.DataFrame(np.divide(arr, max_abs_val or 1.0, order='F'), index=df.index, columns=df.columns,
+                               copy=False)
         df_norm_ls.append(df_norm)
         max_abs_val_ls.append(max_abs_val)
         
     return df_norm_ls, max_abs_val_ls
+
+
+def _map_ls(fn, ls, n_jobs=1):
+    """
+    This function applies a function to every item of a list (e.g., a list of DataFrames) and returns the results in a
+        list, in the same order. If n_jobs is not 1, the calls are spread over a pool of threads. Threads are used
+        rather than processes, since pandas and numpy release the GIL during file reads and most array computations,
+        and the DataFrames then don't have to be copied (pickled) to and from worker processes.
+
+    Parameters:
+    :param fn: The function to apply to each item of ls.
+    :param ls: A list of items (e.g., pandas DataFrames) to apply fn to.
+    :param n_jobs: The number of threads to use. If n_jobs < 1, one thread per CPU is used. With n_jobs=1, the items are
+        processed one after another in the calling thread.
+    :return: A list of the results of fn for each item of ls.
+    """
+    if n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs == 1 or len(ls) <= 1:
+        return [fn(item) for item in ls]
+    with ThreadPoolExecutor(max_workers=min(n_jobs, len(ls))) as executor:
+        return list(executor.map(fn, ls))
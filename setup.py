@@ -10,6 +10,8 @@ setup(name='df_tools',
       license=license,
       url='https://github.com/xfaxca/df_tools',
       packages=find_packages(exclude=('tests', 'dist')),
-      install_requires=['numpy==1.11.2',
-                        'pandas==0.18.1',
-                        'pathlib2==2.1.0'])
+      python_requires='>=3.8',
+      install_requires=['numpy>=1.24',
+                        'pandas>=2.0',
+                        'bottleneck>=1.3'],
+      extras_require={'numba': ['numba>=0.58']})
@@ -0,0 +1,130 @@
+# test_kernels.py
+
+"""
+Tests comparing the compiled kernels in df_tools._kernels, and the df_utils/list_utils functions that use them, to
+their numpy/pandas fallbacks. The kernels are only used for arrays of at least NUMBA_MIN_SIZE elements, so the test
+DataFrames are built at that size. Run with pytest; the kernel tests are skipped if numba is not installed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import df_tools._kernels as _kernels
+import df_tools.df_utils as df_utils
+import df_tools.list_utils as list_utils
+
+requires_numba = pytest.mark.skipif(not _kernels.HAS_NUMBA, reason='numba is not installed')
+
+N_COLS = 5
+N_ROWS = _kernels.NUMBA_MIN_SIZE // N_COLS
+
+
+def example_arr(dtype=np.float64):
+    """
+    This function creates an array of NUMBA_MIN_SIZE elements containing random values, a NaN, an all-zero column, an
+        all-NaN column and an all-NaN row.
+    :param dtype: dtype of the returned array.
+    :return: arr: 2D numpy array of N_ROWS rows and N_COLS columns.
+    """
+    rng = np.random.default_rng(0)
+    arr = rng.standard_normal((N_ROWS, N_COLS)) * 100
+    arr[3, 0] = np.nan
+    arr[:, 1] = 0.0
+    arr[:, 2] = np.nan
+    arr[7, :] = np.nan
+    return arr.astype(dtype)
+
+
+@requires_numba
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_use_numba_float32_float64(dtype):
+    assert _kernels.use_numba(example_arr(dtype))
+    assert not _kernels.use_numba(example_arr(dtype)[:-1])
+
+
+@pytest.mark.parametrize('dtype', [np.float16, '>f8', np.int64])
+def test_use_numba_unsupported_dtypes(dtype):
+    assert not _kernels.use_numba(np.zeros((N_ROWS, N_COLS), dtype=dtype))
+
+
+@requires_numba
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_col_absmax(dtype):
+    arr = example_arr(dtype)
+    result = _kernels.col_absmax(arr)
+    # The kernel gives 0 for all-NaN columns, where fmax gives NaN.
+    expected = np.nan_to_num(np.fmax.reduce(np.abs(arr), axis=0), nan=0.0)
+    assert result.dtype == arr.dtype
+    np.testing.assert_array_equal(result, expected)
+
+
+@requires_numba
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_row_nanmean(dtype):
+    arr = example_arr(dtype)
+    result = _kernels.row_nanmean(arr)
+    expected = pd.DataFrame(arr.astype(np.float64)).mean(axis=1).to_numpy()
+    assert result.dtype == arr.dtype
+    np.testing.assert_allclose(result, expected, rtol=1e-6 if dtype == np.float32 else 1e-12)
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64])
+def test_norm_cols_each_kernel_matches_numpy(dtype):
+    df = pd.DataFrame(example_arr(dtype))
+    result = df_utils.norm_cols_each(df)
+    expected = df_utils._norm_cols_each(df, use_kernel=False)
+    assert list(result.dtypes) == [np.dtype(dtype)] * N_COLS
+    pd.testing.assert_frame_equal(result, expected)
+    # All-zero columns stay zero (apart from the all-NaN row), and NaNs stay NaN.
+    assert (result[1].drop(index=7) == 0).all()
+    assert result[2].isna().all()
+    assert np.isnan(result.iloc[3, 0])
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64])
+def test_norm_cols_each_ls_matches_norm_cols_each(dtype):
+    df = pd.DataFrame(example_arr(dtype))
+    expected = df_utils.norm_cols_each(df)
+    for n_jobs in (1, 2):
+        for result in list_utils.norm_cols_each_ls([df, df], n_jobs=n_jobs):
+            pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('dtype', [np.float16, np.float32, np.float64])
+def test_avg_rows_matches_pandas(dtype):
+    df = pd.DataFrame(example_arr(dtype))
+    result = df_utils.avg_rows(df)['Averages']
+    assert result.dtype == np.dtype(dtype)
+    np.testing.assert_allclose(result.to_numpy(dtype=np.float64), df.astype(np.float64).mean(axis=1).to_numpy(),
+                               rtol=1e-2 if dtype == np.float16 else 1e-5)
+
+
+def test_kernel_callers_from_threads():
+    df = pd.DataFrame(example_arr())
+    expected_norm = df_utils.norm_cols_each(df)
+    expected_avgs = df_utils.avg_rows(df)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        norm_results = list(executor.map(df_utils.norm_cols_each, [df] * 8))
+        avg_results = list(executor.map(df_utils.avg_rows, [df] * 8))
+    for result in norm_results:
+        pd.testing.assert_frame_equal(result, expected_norm)
+    for result in avg_results:
+        pd.testing.assert_frame_equal(result, expected_avgs)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_norm_cols_each_output_dtype(dtype):
+    df = pd.DataFrame(example_arr(np.float64))
+    result = df_utils.norm_cols_each(df, dtype=dtype)
+    expected = df_utils._norm_cols_each(df, dtype=dtype, use_kernel=False)
+    assert list(result.dtypes) == [np.dtype(dtype)] * N_COLS
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('dtype', [int, np.int32, 'Float64', 'not a dtype'])
+def test_norm_cols_each_rejects_non_float_dtype(dtype):
+    with pytest.raises(df_utils._ec.DFToolsValidationError):
+        df_utils.norm_cols_each(pd.DataFrame(example_arr()), dtype=dtype)
@@ -60,8 +60,10 @@ def example_dfs():
     This function creates a list of pandas DataFrames for demonstration of the functions in df_tools
     :return: df_ls: A list of DataFrames intended for use in df_tools examples within test_script.py
     """
-    # Column names for random df
+    # Column names for all dfs. A CategoricalIndex stores the labels once and compares integer codes when columns are
+    # looked up or dropped.
     colnames = ['Col1', 'Col2', 'Col3', 'Col4', 'Col5']
+    col_idx = pd.CategoricalIndex(colnames)
     # Lists for trig functions
     x = [0, 30, 60, 90, 120, 150, 180, 210, 240, 270, 300, 330]
     x2 = [30, 60, 90, 120, 0, 240, 270, 300, 150, 180, 210, 330]
@@ -70,29 +72,20 @@ def example_dfs():
     x5 = [330, 300, 270, 240, 210, 180, 150, 120, 90, 60, 30, 0]
     x_ls = [x, x2, x3, x4, x5]
     y_ls = repeat_multi_ls(ls_of_ls=x_ls, iterations=10)
+    # Stack the repeated lists as the columns of one array, so that each trig function is called once for all columns.
+    y_arr = np.column_stack(y_ls)
 
     # Random number df with 150 columns
-    df_rand = pd.DataFrame(abs(np.random.randn(150, 5) * 1000), columns=colnames)
+    df_rand = pd.DataFrame(abs(np.random.randn(150, 5) * 1000), columns=col_idx)
     # Sine df with 120 columns
-    df_sin = pd.DataFrame(data={"Col1": np.sin(y_ls[0]) * 1,
-                                "Col2": np.sin(y_ls[1]) * 2,
-                                "Col3": np.sin(y_ls[2]) * 3,
-                                "Col4": np.sin(y_ls[3]) * 4,
-                                "Col5": np.sin(y_ls[4]) * 5})
+    df_sin = pd.DataFrame(np.sin(y_arr) * np.array([1, 2, 3, 4, 5]), columns=col_idx)
     # Cosine df with 120 columns
-    df_cos = pd.DataFrame(data={"Col1": np.cos(y_ls[0]) * 4,
-                                "Col2": np.cos(y_ls[1]) * 3,
-                                "Col3": np.cos(y_ls[2]) * 5,
-                                "Col4": np.cos(y_ls[3]) * 1,
-                                "Col5": np.cos(y_ls[4]) * 2})
+    df_cos = pd.DataFrame(np.cos(y_arr) * np.array([4, 3, 5, 1, 2]), columns=col_idx)
     # Tangent df with 120 columns
-    df_tan = pd.DataFrame(data={"Col1": np.tan(y_ls[0]) * 5,
-                                "Col2": np.tan(y_ls[1]) * 1,
-                                "Col3": np.tan(y_ls[2]) * 2,
-                                "Col4": np.tan(y_ls[3]) * 4,
-                                "Col5": np.tan(y_ls[4]) * 3})
+    df_tan = pd.DataFrame(np.tan(y_arr) * np.array([5, 1, 2, 4, 3]), columns=col_idx)
 
-    df_ls = [df_rand, df_sin, df_cos, df_tan]
+    # Single precision is sufficient for these example values and halves the memory of each DataFrame.
+    df_ls = [df.astype(np.float32) for df in [df_rand, df_sin, df_cos, df_tan]]
 
     return df_ls
 
@@ -103,18 +96,11 @@ def repeat_multi_ls(ls_of_ls=[], iterations=2):
         is performed iterations number of times.
     :param ls_of_ls: A list of lists for which the repretition/extension is to be performed
     :param iterations: The number of iterations by which to repeat each list in ls_of_ls
-    :return: ls_of_ls_new: A new list of lists wherein each member list corresponds to the list in ls_of_ls at the
-        same index. Each list will be extended by repetitions of itself and will have a length of
+    :return: ls_of_ls_new: A new list of numpy arrays wherein each member array corresponds to the list in ls_of_ls at
+        the same index. Each array will contain repetitions of the list and will have a length of
         iterations*len(ls_of_ls[i]) for list i.
     """
-    ls_of_ls_new = []
-    for ls in ls_of_ls:
-        new_ls_tmp = []
-        for iter in range(iterations):
-            for element in ls:
-                new_ls_tmp.append(element)
-                # print('y_tmp is now:', y_tmp)
-        ls_of_ls_new.append(new_ls_tmp)
+    ls_of_ls_new = [np.tile(np.asarray(ls), iterations) for ls in ls_of_ls]
 
     return ls_of_ls_new
 